@@ -1,7 +1,10 @@
 import subprocess
 import logging
 from logging import StreamHandler
-import json
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import queue
+import orjson
 import os
 import requests
 import time
@@ -9,13 +12,18 @@ import threading
 import httpx
 import urllib.parse
 import signal
+import fcntl
+import hashlib
+import heapq
+import itertools
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor
-from flask import Flask, request, jsonify, Response, stream_with_context, render_template
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import Flask, request, jsonify, Response, render_template
 from werkzeug.utils import secure_filename
+from werkzeug.wsgi import ClosingIterator
 
 # --- Import Plugin System ---
-from plugins import discovered_plugins
+from plugins import discovered_plugins, get_plugin
 
 app = Flask(__name__)
 
@@ -41,21 +49,40 @@ class DequeLogHandler(StreamHandler):
         except Exception: self.handleError(record)
 
 # --- Basic Configuration ---
+# QueueHandler still merges the message args and renders any traceback on the
+# calling thread; the final formatting and the writes to the console and the log
+# buffer happen on the listener's own thread, off the request path.
 log_format = '%(asctime)s - %(levelname)s - %(message)s'
-logging.basicConfig(level=logging.INFO, format=log_format)
-root_logger = logging.getLogger()
-deque_handler = DequeLogHandler(log_buffer)
 formatter = logging.Formatter(log_format)
+console_handler = StreamHandler()
+console_handler.setFormatter(formatter)
+deque_handler = DequeLogHandler(log_buffer)
 deque_handler.setFormatter(formatter)
-root_logger.addHandler(deque_handler)
+log_queue = queue.Queue() # Unbounded, so a burst of records is never dropped
+root_logger = logging.getLogger()
+root_logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, console_handler, deque_handler)
+log_listener.start()
+atexit.register(log_listener.stop) # Flush anything still queued on shutdown
+logging.getLogger('httpx').setLevel(logging.WARNING) # httpx logs every request at INFO
 
 # --- Environment & Global Variables ---
 CONFIG_DIR = os.getenv('CONFIG_DIR', '/app/config')
 CONFIG_FILE_PATH = os.path.join(CONFIG_DIR, 'roku_channels.json')
+UPLOAD_BUFFER_SIZE = 1024 * 1024 # Copy uploads to disk in 1 MB blocks
+KEYPRESS_GAP = float(os.getenv('KEYPRESS_GAP', '0.5')) # Default pause between keypresses, in seconds
 DEBUG_LOGGING_ENABLED = os.getenv('ENABLE_DEBUG_LOGGING', 'false').lower() == 'true'
+root_logger.setLevel(logging.DEBUG if DEBUG_LOGGING_ENABLED else logging.INFO)
+# Keep HTTP client internals at their previous verbosity when debug logging is on
+logging.getLogger('urllib3').setLevel(logging.INFO)
+logging.getLogger('httpcore').setLevel(logging.INFO)
 ENCODING_MODE = os.getenv('ENCODING_MODE', 'proxy').lower()
 AUDIO_BITRATE = os.getenv('AUDIO_BITRATE', '128k')
-SILENT_TS_PACKET = b'\x47\x40\x11\x10\x00\x02\xb0\x0d\x00\x01\xc1\x00\x00' + b'\xff' * 175
+# MPEG-TS null packet (PID 0x1FFF): valid filler that demuxers discard, and whose
+# continuity counter is ignored, so the same packet can be repeated verbatim.
+NULL_TS_PACKET = b'\x47\x1f\xff\x10' + b'\xff' * 184
+BLANK_CHUNK = NULL_TS_PACKET * 349 # ~64 KB of filler, sent once per blanking tick
+BLANK_INTERVAL = 0.5 # Seconds between blanking ticks
 
 def get_audio_channels():
     channels_input = os.getenv('AUDIO_CHANNELS', '2').lower()
@@ -64,80 +91,201 @@ AUDIO_CHANNELS = get_audio_channels()
 
 # --- State Management ---
 TUNERS, CHANNELS, EPG_CHANNELS, ONDEMAND_APPS, ONDEMAND_SETTINGS = [], [], [], [], {}
-TUNER_LOCK = threading.Lock()
-KEEP_ALIVE_TASKS = {}
+TUNERS_BY_IP, CHANNELS_BY_ID = {}, {} # Lookup indexes, rebuilt by load_config()
+KEEP_ALIVE_TASKS = {} # Tuner IP -> cancel Event of its scheduled keep-alive
+KEEP_ALIVE_LOCK = threading.Lock()
 # --- NEW: Multi-session support for pre-tuning ---
-PREVIEW_SESSIONS = {} # Keyed by tuner IP
-SESSION_LOCK = threading.Lock()
+# Keyed by tuner IP. Only single get/set/pop operations are used on this dict,
+# each of which is atomic, so it needs no lock of its own.
+PREVIEW_SESSIONS = {}
+# Serialized /api/pretune/status body as (built_at, body). The pretune page polls
+# it, so concurrent pollers share one build for up to PRETUNE_STATUS_TTL seconds.
+PRETUNE_STATUS_TTL = 0.5
+PRETUNE_STATUS_SNAPSHOT = (0.0, b'')
+# Rendered playlists keyed by (list name, playlist filter) -> (digest, body parts).
+# Clients poll these files, so they are built once and cleared by load_config().
+# Only filters naming a configured playlist are cached, and the client's host is
+# joined into the parts per response, so clients can't grow the cache.
+M3U_CACHE = {}
+M3U_HOST_PLACEHOLDER = b'\x00host\x00'
+# Serialized /api/config GET body as ((mtime_ns, size), body); re-read only when the file changes.
+CONFIG_BODY_CACHE = (None, b'')
 
 roku_session = requests.Session()
-roku_session.timeout = 8 # Increased timeout for better reliability
 roku_session.headers.update({"Connection": "close"}) # Prevent stale connections
-executor = ThreadPoolExecutor(max_workers=10) # Increased workers for more concurrent tasks
+# requests ignores a session-level timeout, so every Roku call passes one explicitly
+ROKU_TIMEOUT = 8
+
+def roku_post(url, timeout=ROKU_TIMEOUT):
+    return roku_session.post(url, timeout=timeout)
+# Short tuning work (launch + key sequence, keep-alives, release keypresses)
+TUNE_EXECUTOR = ThreadPoolExecutor(max_workers=10, thread_name_prefix='tune')
+# Long remote-control sequences such as reboot get their own pool so they never delay a tune.
+# KEYSEQ_SLOTS caps running + queued sequences; past that, requests are refused with a 503.
+KEYSEQ_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='keyseq')
+KEYSEQ_SLOTS = threading.BoundedSemaphore(8)
+
+def submit_key_sequence(*args, **kwargs):
+    if not KEYSEQ_SLOTS.acquire(blocking=False):
+        return None
+    future = KEYSEQ_EXECUTOR.submit(send_key_sequence, *args, **kwargs)
+    future.add_done_callback(lambda _: KEYSEQ_SLOTS.release())
+    return future
+# Reused by every /api/status call. The Roku and the encoder of each tuner are probed
+# separately; /api/status waits up to STATUS_TIMEOUT for them, then reports the last
+# completed result of any probe still running (or 'Timeout' if there is none yet).
+STATUS_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+STATUS_TIMEOUT = 4 # One probe request: 1 s to connect plus 3 s for the response
+# Last completed probe results keyed by ('roku', ip) or ('encoder', url) -> (fresh_until, result).
+# A new probe is started only once a result is older than STATUS_CACHE_TTL.
+STATUS_CACHE_TTL = 5
+STATUS_CACHE = {}
+# Probes still running, by the same key. A poll joins a running probe instead of
+# submitting another, so a hanging device never holds more than one worker.
+STATUS_IN_FLIGHT = {}
+STATUS_CACHE_LOCK = threading.Lock()
+# Kept-alive connections for /api/status probes, so repeated polls skip the TCP handshake
+PROBE_TIMEOUT = httpx.Timeout(3.0, connect=1.0)
+PROBE_CLIENT = httpx.Client(timeout=PROBE_TIMEOUT, follow_redirects=True, limits=httpx.Limits(max_connections=64, max_keepalive_connections=32))
+# Shared pool for pulling encoder streams, so each stream start can reuse a connection
+STREAM_CLIENT = httpx.Client(timeout=15, follow_redirects=True, limits=httpx.Limits(max_connections=64, max_keepalive_connections=32))
+
+# --- JSON Responses ---
+# Drop-in for jsonify() on frequently polled endpoints; orjson is much faster than stdlib json.
+def ojsonify(obj):
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+# --- Server Reload ---
+# Plugin uploads need fresh code, so they ask the gunicorn master to reload through
+# SIGHUP (config changes are applied in place by load_config). Requests arriving
+# within RELOAD_DEBOUNCE_SECONDS of each other share a single reload.
+RELOAD_DEBOUNCE_SECONDS = 0.5
+reload_pending = threading.Event()
+
+def reload_coalescer():
+    while True:
+        reload_pending.wait()
+        time.sleep(RELOAD_DEBOUNCE_SECONDS)
+        reload_pending.clear()
+        os.kill(os.getppid(), signal.SIGHUP)
+
+def request_server_reload():
+    reload_pending.set()
+
+threading.Thread(target=reload_coalescer, daemon=True).start()
 
 # --- Core Application Logic ---
 
 def load_config():
-    global TUNERS, CHANNELS, EPG_CHANNELS, ONDEMAND_APPS, ONDEMAND_SETTINGS
+    global TUNERS, CHANNELS, EPG_CHANNELS, ONDEMAND_APPS, ONDEMAND_SETTINGS, TUNERS_BY_IP, CHANNELS_BY_ID
     if not os.path.exists(CONFIG_FILE_PATH):
-        logging.warning(f"Config file not found at {CONFIG_FILE_PATH}. Creating default.")
+        logging.warning("Config file not found at %s. Creating default.", CONFIG_FILE_PATH)
         try:
             os.makedirs(CONFIG_DIR, exist_ok=True)
-            with open(CONFIG_FILE_PATH, 'w') as f:
-                json.dump({"tuners": [], "channels": [], "epg_channels": [], "ondemand_apps": [], "ondemand_settings": {}}, f, indent=2)
+            with open(CONFIG_FILE_PATH, 'wb') as f:
+                f.write(orjson.dumps({"tuners": [], "channels": [], "epg_channels": [], "ondemand_apps": [], "ondemand_settings": {}}, option=orjson.OPT_INDENT_2))
         except Exception as e:
-            logging.error(f"Could not create default config: {e}")
+            logging.error("Could not create default config: %s", e)
     try:
-        with open(CONFIG_FILE_PATH, 'r') as f: config_data = json.load(f) or {}
-        TUNERS = sorted(config_data.get('tuners', []), key=lambda x: x.get('priority', 99))
-        for tuner in TUNERS: tuner['in_use'] = False
-        CHANNELS = config_data.get('channels', [])
-        EPG_CHANNELS = config_data.get('epg_channels', [])
+        with open(CONFIG_FILE_PATH, 'rb') as f: config_data = orjson.loads(f.read()) or {}
+        tuners = sorted(config_data.get('tuners', []), key=lambda x: x.get('priority', 99))
+        # Each tuner carries its own lock for state changes and an Event for its
+        # in-use flag, so callers touching different tuners never contend and
+        # status readers can check `in_use.is_set()` without locking.
+        # A tuner that is still configured keeps its existing state, so streams
+        # running across a config save stay accounted for.
+        for tuner in tuners:
+            previous = TUNERS_BY_IP.get(tuner.get('roku_ip'))
+            tuner['lock'] = previous['lock'] if previous else threading.Lock()
+            tuner['in_use'] = previous['in_use'] if previous else threading.Event()
+            tuner['generation'] = previous['generation'] if previous else 0 # Bumped on every claim
+        channels = config_data.get('channels', [])
+        epg_channels = config_data.get('epg_channels', [])
+        # Gracenote channels are indexed last so they win on a duplicate id, as before.
+        channels_by_id = {c['id']: c for c in epg_channels}
+        channels_by_id.update({c['id']: c for c in channels})
+
+        # Everything is built; publish it in one step so requests never see a half-loaded config.
+        TUNERS, TUNERS_BY_IP = tuners, {t['roku_ip']: t for t in tuners}
+        CHANNELS, EPG_CHANNELS, CHANNELS_BY_ID = channels, epg_channels, channels_by_id
         ONDEMAND_APPS = config_data.get('ondemand_apps', [])
         ONDEMAND_SETTINGS = config_data.get('ondemand_settings', {})
-        if DEBUG_LOGGING_ENABLED:
-            logging.info(f"Loaded {len(TUNERS)} tuners, {len(CHANNELS)} Gracenote, {len(EPG_CHANNELS)} EPG channels, {len(ONDEMAND_APPS)} On-Demand apps.")
+        invalidate_pretune_status()
+        M3U_CACHE.clear()
+        logging.debug("Loaded %s tuners, %s Gracenote, %s EPG channels, %s On-Demand apps.", len(TUNERS), len(CHANNELS), len(EPG_CHANNELS), len(ONDEMAND_APPS))
     except Exception as e:
-        logging.error(f"Error loading config: {e}")
+        logging.error("Error loading config: %s", e)
+
+def invalidate_pretune_status():
+    global PRETUNE_STATUS_SNAPSHOT
+    PRETUNE_STATUS_SNAPSHOT = (0.0, b'')
 
 def lock_tuner():
-    with TUNER_LOCK:
-        for tuner in TUNERS:
-            if not tuner.get('in_use'):
-                tuner['in_use'] = True
-                if DEBUG_LOGGING_ENABLED: logging.info(f"Locked tuner: {tuner.get('name')}")
-                return tuner
+    for tuner in TUNERS:
+        # Skip busy tuners, and tuners another request is claiming right now.
+        if tuner['in_use'].is_set() or not tuner['lock'].acquire(blocking=False):
+            continue
+        try:
+            if tuner['in_use'].is_set():
+                continue
+            tuner['in_use'].set()
+            tuner['generation'] += 1
+        finally:
+            tuner['lock'].release()
+        invalidate_pretune_status()
+        logging.debug("Locked tuner: %s", tuner.get('name'))
+        return tuner
     return None
 
 def release_tuner(tuner_ip):
-    if tuner_ip in KEEP_ALIVE_TASKS:
-        thread, stop_event = KEEP_ALIVE_TASKS.pop(tuner_ip)
-        stop_event.set()
-        thread.join(timeout=5)
-
-    was_in_preview = False
-    with SESSION_LOCK:
-        if tuner_ip in PREVIEW_SESSIONS:
-            was_in_preview = True
-            del PREVIEW_SESSIONS[tuner_ip]
-            logging.info(f"Cleared preview session for tuner {tuner_ip}")
-
-    with TUNER_LOCK:
-        for tuner in TUNERS:
-            if tuner.get('roku_ip') == tuner_ip:
-                if tuner.get('in_use') or was_in_preview:
-                    tuner['in_use'] = False
-                    logging.info(f"Released tuner: {tuner.get('name')}. Sending Home keypress.")
-                    try:
-                        # Send Home keypress multiple times for reliability
-                        for _ in range(3):
-                            roku_session.post(f"http://{tuner_ip}:8060/keypress/Home")
-                            time.sleep(0.2)
-                    except requests.exceptions.RequestException as e:
-                        logging.error(f"Failed to send Home keypress to {tuner_ip}: {e}")
-                break
-
-def send_key_sequence(device_ip, keys):
+    with KEEP_ALIVE_LOCK:
+        cancelled = KEEP_ALIVE_TASKS.pop(tuner_ip, None)
+    if cancelled: cancelled.set()
+
+    was_in_preview = PREVIEW_SESSIONS.pop(tuner_ip, None) is not None
+    if was_in_preview:
+        logging.info("Cleared preview session for tuner %s", tuner_ip)
+
+    tuner = TUNERS_BY_IP.get(tuner_ip)
+    if not tuner: return
+    with tuner['lock']:
+        if not (tuner['in_use'].is_set() or was_in_preview): return
+        tuner['in_use'].clear()
+        generation = tuner['generation']
+    invalidate_pretune_status()
+    logging.info("Released tuner: %s. Sending Home keypress.", tuner.get('name'))
+    TUNE_EXECUTOR.submit(return_tuner_home, tuner_ip, generation)
+
+def return_tuner_home(tuner_ip, generation):
+    try:
+        # Send Home keypress multiple times for reliability
+        for _ in range(3):
+            # Stop once the tuner has been claimed again, so a late Home can't
+            # interrupt the stream that was just tuned on it.
+            tuner = TUNERS_BY_IP.get(tuner_ip)
+            if not tuner or tuner['generation'] != generation: return
+            roku_post(f"http://{tuner_ip}:8060/keypress/Home", timeout=2)
+            time.sleep(0.2)
+    except requests.exceptions.RequestException as e:
+        logging.error("Failed to send Home keypress to %s: %s", tuner_ip, e)
+
+def is_wait_step(key):
+    return (isinstance(key, dict) and 'wait' in key) or (isinstance(key, str) and key.lower().startswith('wait='))
+
+def send_key_sequence(device_ip, keys, default_delay=KEYPRESS_GAP):
+    # A 'delay=<seconds>' entry sets the gap after every key before it; keys with
+    # no later 'delay=' entry use default_delay. Resolved once, back to front.
+    key_gaps = [default_delay] * len(keys)
+    gap = default_delay
+    last_step = -1
+    for i in range(len(keys) - 1, -1, -1):
+        key_gaps[i] = gap
+        if isinstance(keys[i], str) and keys[i].startswith('delay='):
+            try: gap = float(keys[i].split('=')[1])
+            except (ValueError, IndexError): logging.error("Invalid delay command: %s", keys[i])
+        elif last_step < 0:
+            last_step = i
+
     for i, key in enumerate(keys):
         try:
             if isinstance(key, dict) and 'wait' in key:
@@ -145,109 +293,189 @@ def send_key_sequence(device_ip, keys):
                 continue
             if isinstance(key, str) and key.lower().startswith('wait='):
                 try: duration = float(key.split('=')[1]); time.sleep(duration); continue
-                except (ValueError, IndexError): logging.error(f"Invalid wait command: {key}"); continue
+                except (ValueError, IndexError): logging.error("Invalid wait command: %s", key); continue
+            if isinstance(key, str) and key.startswith('delay='):
+                continue
             
             safe_key = f"Lit_{urllib.parse.quote(key)}" if len(key) == 1 else key
-            roku_session.post(f"http://{device_ip}:8060/keypress/{safe_key}")
-            if DEBUG_LOGGING_ENABLED: logging.info(f"Sent key '{key}' to {device_ip}")
+            roku_post(f"http://{device_ip}:8060/keypress/{safe_key}")
+            logging.debug("Sent key '%s' to %s", key, device_ip)
             
-            # Use a configurable delay if provided in the channel data, otherwise default
-            custom_delay = next((float(k.split('=')[1]) for k in keys[i+1:] if isinstance(k, str) and k.startswith('delay=')), 0.5)
-            time.sleep(custom_delay)
+            # No gap is needed after the last key or right before an explicit wait step
+            if i < last_step and not is_wait_step(keys[i + 1]):
+                time.sleep(key_gaps[i])
 
         except requests.exceptions.RequestException as e:
-            logging.error(f"Failed to send key '{key}' to {device_ip}: {e}")
+            logging.error("Failed to send key '%s' to %s: %s", key, device_ip, e)
             # --- NEW: Retry mechanism ---
             for attempt in range(2): # Retry up to 2 times
                 time.sleep(1) # Wait before retrying
                 try:
-                    roku_session.post(f"http://{device_ip}:8060/keypress/{safe_key}")
-                    logging.info(f"Successfully sent key '{key}' on retry {attempt + 1}")
+                    roku_post(f"http://{device_ip}:8060/keypress/{safe_key}")
+                    logging.info("Successfully sent key '%s' on retry %s", key, attempt + 1)
                     break
                 except requests.exceptions.RequestException:
                     if attempt == 1:
-                        logging.error(f"Failed to send key '{key}' after multiple retries.")
+                        logging.error("Failed to send key '%s' after multiple retries.", key)
                         return False # Abort sequence on persistent failure
     return True
 
 
-def keep_alive_sender(roku_ip, key_string, interval_minutes, stop_event):
-    keys = [k.strip() for k in key_string.split(',')]
-    interval_seconds = interval_minutes * 60
-    while not stop_event.wait(interval_seconds):
-        try:
-            logging.info(f"[Keep-Alive] Sending sequence {keys} to {roku_ip} to prevent timeout.")
-            send_key_sequence(roku_ip, keys)
-        except Exception as e:
-            logging.error(f"[Keep-Alive] Error sending key sequence to {roku_ip}: {e}")
+def keep_alive_sender(roku_ip, keys, cancelled):
+    if cancelled.is_set(): return # Tuner was released while this send was queued
+    try:
+        logging.info("[Keep-Alive] Sending sequence %s to %s to prevent timeout.", keys, roku_ip)
+        send_key_sequence(roku_ip, keys)
+    except Exception as e:
+        logging.error("[Keep-Alive] Error sending key sequence to %s: %s", roku_ip, e)
+
+# --- Keep-Alive Scheduling ---
+# A single thread sleeps until the next keep-alive is due across all tuners and
+# hands the key sequence to TUNE_EXECUTOR, instead of one sleeping thread per tuner.
+# Heap entries are (due, seq, roku_ip, keys, interval_seconds, cancelled); seq
+# keeps ordering stable when two tuners are due at the same moment.
+class KeepAliveScheduler(threading.Thread):
+    def __init__(self):
+        super().__init__(name='keep-alive', daemon=True)
+        self.heap = []
+        self.seq = itertools.count()
+        self.wakeup = threading.Condition()
+
+    def schedule(self, roku_ip, key_string, interval_minutes):
+        keys = [k.strip() for k in key_string.split(',')]
+        interval_seconds = interval_minutes * 60
+        cancelled = threading.Event()
+        with self.wakeup:
+            heapq.heappush(self.heap, (time.monotonic() + interval_seconds, next(self.seq), roku_ip, keys, interval_seconds, cancelled))
+            self.wakeup.notify()
+        return cancelled
+
+    def run(self):
+        while True:
+            with self.wakeup:
+                while self.heap and self.heap[0][5].is_set():
+                    heapq.heappop(self.heap) # Drop entries for released tuners
+                if not self.heap:
+                    self.wakeup.wait()
+                    continue
+                remaining = self.heap[0][0] - time.monotonic()
+                if remaining > 0:
+                    self.wakeup.wait(remaining)
+                    continue
+                _, _, roku_ip, keys, interval_seconds, cancelled = heapq.heappop(self.heap)
+                heapq.heappush(self.heap, (time.monotonic() + interval_seconds, next(self.seq), roku_ip, keys, interval_seconds, cancelled))
+            TUNE_EXECUTOR.submit(keep_alive_sender, roku_ip, keys, cancelled)
+
+KEEP_ALIVE_SCHEDULER = KeepAliveScheduler()
+KEEP_ALIVE_SCHEDULER.start()
+
+# Waits between tuning steps run on a timer, and the next step is handed back to
+# TUNE_EXECUTOR, so no pool worker sits idle through tune_delay.
+def schedule_tuning_step(delay, step, *args):
+    timer = threading.Timer(delay, TUNE_EXECUTOR.submit, args=(step, *args))
+    timer.daemon = True
+    timer.start()
 
 def execute_tuning_in_background(roku_ip, channel_data):
     try:
-        if DEBUG_LOGGING_ENABLED: logging.info(f"Tuning to actual channel {channel_data['name']}...")
+        logging.debug("Tuning to actual channel %s...", channel_data['name'])
         launch_url = f"http://{roku_ip}:8060/launch/{channel_data['roku_app_id']}"
-        roku_session.post(launch_url)
-        time.sleep(channel_data.get("tune_delay", 1))
+        roku_post(launch_url)
+    except Exception as e:
+        logging.error("Error during background tuning for %s: %s", roku_ip, e)
+        return
+    schedule_tuning_step(channel_data.get("tune_delay", 1), finish_tuning, roku_ip, channel_data, launch_url)
+
+def get_key_delay(channel_data):
+    # Channels whose app needs a slower (or tolerates a faster) pace can set 'key_delay'
+    value = channel_data.get('key_delay', KEYPRESS_GAP)
+    try:
+        key_delay = float(value)
+        if not 0 <= key_delay < float('inf'): raise ValueError # Also rejects nan and inf, which time.sleep can't take
+    except (TypeError, ValueError):
+        logging.warning("Invalid key_delay %r for channel %s. Using %s.", value, channel_data.get('name'), KEYPRESS_GAP)
+        return KEYPRESS_GAP
+    return key_delay
+
+def finish_tuning(roku_ip, channel_data, launch_url):
+    key_delay = get_key_delay(channel_data)
+    try:
         plugin_script = channel_data.get('plugin_script')
         key_sequence = channel_data.get('key_sequence')
-        if plugin_script and plugin_script in discovered_plugins:
-            plugin = discovered_plugins[plugin_script]
+        plugin = get_plugin(plugin_script) if plugin_script else None
+        if plugin:
             final_sequence = plugin.tune_channel(roku_ip, channel_data)
-            if final_sequence: send_key_sequence(roku_ip, final_sequence)
+            if final_sequence: send_key_sequence(roku_ip, final_sequence, key_delay)
         elif key_sequence:
-            send_key_sequence(roku_ip, key_sequence)
+            send_key_sequence(roku_ip, key_sequence, key_delay)
         else:
             content_id = channel_data.get('deep_link_content_id')
             if content_id:
                 media_type = channel_data.get('media_type', 'live')
                 params = f"?contentId={content_id}&mediaType={media_type}"
-                roku_session.post(f"{launch_url}{params}")
+                roku_post(f"{launch_url}{params}")
         if channel_data.get('needs_select_keypress'):
-            time.sleep(1)
-            send_key_sequence(roku_ip, ["Select"])
+            schedule_tuning_step(1, send_key_sequence, roku_ip, ["Select"])
     except Exception as e:
-        logging.error(f"Error during background tuning for {roku_ip}: {e}")
+        logging.error("Error during background tuning for %s: %s", roku_ip, e)
+
+# Start output sooner: skip input buffering and cap stream probing at ~1 s of
+# encoder MPEG-TS instead of ffmpeg's 5 s default, which delays every tune.
+FFMPEG_INPUT_ARGS = ('-fflags', '+nobuffer', '-probesize', '500000', '-analyzeduration', '1000000')
+# Output arguments per encoding mode; fixed for the life of the process, so built once.
+FFMPEG_OUTPUT_ARGS = {
+    'remux': ('-c', 'copy', '-f', 'mpegts', '-loglevel', 'error', '-'),
+    'reencode': ('-c:v', 'copy', '-c:a', 'aac', '-b:a', AUDIO_BITRATE, '-ac', AUDIO_CHANNELS, '-f', 'mpegts', '-loglevel', 'error', '-'),
+}
+# Live MPEG-TS must not be held back by a reverse proxy (nginx buffers by default) or cached.
+LIVE_STREAM_HEADERS = {'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'}
+FFMPEG_PIPE_SIZE = 1 << 20 # 1 MiB stdout pipe, the default unprivileged maximum on Linux
 
 def stream_generator(encoder_url, roku_ip_to_release, mode='proxy', blank_duration=0):
     try:
         if blank_duration > 0:
-            start_time = time.time()
-            while time.time() - start_time < blank_duration:
-                yield SILENT_TS_PACKET
-                time.sleep(0.1)
-        if mode in ['remux', 'reencode']:
-            command = ['ffmpeg', '-i', encoder_url]
-            if mode == 'reencode':
-                command.extend(['-c:v', 'copy', '-c:a', 'aac', '-b:a', AUDIO_BITRATE, '-ac', AUDIO_CHANNELS])
-            else:
-                command.extend(['-c', 'copy'])
-            command.extend(['-f', 'mpegts', '-loglevel', 'error', '-'])
-            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            for chunk in iter(lambda: process.stdout.read(8192), b''): yield chunk
-            process.wait()
+            next_tick = time.monotonic()
+            deadline = next_tick + blank_duration
+            while next_tick < deadline:
+                yield BLANK_CHUNK
+                # Ticks are fixed offsets from the start, so slow client writes don't stretch the blanking
+                next_tick += BLANK_INTERVAL
+                time.sleep(max(0, min(next_tick, deadline) - time.monotonic()))
+        if mode in FFMPEG_OUTPUT_ARGS:
+            command = ['ffmpeg', *FFMPEG_INPUT_ARGS, '-i', encoder_url, *FFMPEG_OUTPUT_ARGS[mode]]
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+            try: # Let ffmpeg run further ahead before it blocks on a full pipe
+                fcntl.fcntl(process.stdout.fileno(), fcntl.F_SETPIPE_SZ, FFMPEG_PIPE_SIZE)
+            except OSError as e:
+                logging.debug("Could not resize ffmpeg pipe: %s", e)
+            for chunk in iter(lambda: process.stdout.read(65536), b''): yield chunk
+            if process.wait() != 0:
+                logging.warning("ffmpeg exited with code %s for %s (%s)", process.returncode, roku_ip_to_release, mode)
         else: # Proxy
-            with requests.get(encoder_url, timeout=15, stream=True, allow_redirects=True) as r:
+            with STREAM_CLIENT.stream("GET", encoder_url) as r:
                 r.raise_for_status()
-                for chunk in r.iter_content(chunk_size=8192):
+                for chunk in r.iter_raw(65536):
                     yield chunk
     except Exception as e:
-        logging.error(f"Stream error for {roku_ip_to_release} ({mode}): {e}")
+        logging.error("Stream error for %s (%s): %s", roku_ip_to_release, mode, e)
     finally:
         release_tuner(roku_ip_to_release)
 
 # --- Pre-Tune Session Management ---
 def start_preview_session(tuner_ip):
-    with TUNER_LOCK:
-        tuner = next((t for t in TUNERS if t['roku_ip'] == tuner_ip), None)
-        if not tuner:
-            return {"status": "error", "message": "Tuner not found."}
-        if tuner.get('in_use'):
+    tuner = TUNERS_BY_IP.get(tuner_ip)
+    if not tuner:
+        return {"status": "error", "message": "Tuner not found."}
+    with tuner['lock']:
+        if tuner['in_use'].is_set():
             return {"status": "error", "message": "Tuner is already in use."}
-        tuner['in_use'] = True
+        tuner['in_use'].set()
+        tuner['generation'] += 1
 
-    with SESSION_LOCK:
-        PREVIEW_SESSIONS[tuner_ip] = {'tuner': tuner, 'committed': False}
-        logging.info(f"Started preview session on tuner {tuner['name']}")
-        return {"status": "success", "tuner_name": tuner['name'], "roku_ip": tuner['roku_ip']}
+    PREVIEW_SESSIONS[tuner_ip] = {'tuner': tuner, 'committed': False}
+    invalidate_pretune_status()
+    logging.info("Started preview session on tuner %s", tuner['name'])
+    return {"status": "success", "tuner_name": tuner['name'], "roku_ip": tuner['roku_ip']}
 
 def stop_preview_session(tuner_ip):
     # This function is now just a wrapper for release_tuner for clarity
@@ -255,35 +483,32 @@ def stop_preview_session(tuner_ip):
     return {"status": "success", "message": "Session stopped."}
 
 def commit_preview_session(tuner_ip):
-    with SESSION_LOCK:
-        if tuner_ip not in PREVIEW_SESSIONS:
-            return {"status": "error", "message": "No active preview session to commit."}
-        PREVIEW_SESSIONS[tuner_ip]['committed'] = True
-        tuner_name = PREVIEW_SESSIONS[tuner_ip]['tuner']['name']
-        logging.info(f"Committed preview session for tuner {tuner_name}.")
-        return {"status": "success", "message": "Stream is now ready for Channels DVR."}
+    session = PREVIEW_SESSIONS.get(tuner_ip)
+    if not session:
+        return {"status": "error", "message": "No active preview session to commit."}
+    session['committed'] = True
+    logging.info("Committed preview session for tuner %s.", session['tuner']['name'])
+    return {"status": "success", "message": "Stream is now ready for Channels DVR."}
 
 @app.route('/stream/<channel_id>')
 def stream_channel(channel_id):
     is_preview = request.args.get('preview', 'false').lower() == 'true'
+    channel_data = CHANNELS_BY_ID.get(channel_id)
+    if not channel_data: return "Channel not found.", 404
     locked_tuner = lock_tuner()
     if not locked_tuner: return "All tuners are in use.", 503
-    channel_data = next((c for c in CHANNELS + EPG_CHANNELS if c["id"] == channel_id), None)
-    if not channel_data:
-        release_tuner(locked_tuner['roku_ip'])
-        return "Channel not found.", 404
-    executor.submit(execute_tuning_in_background, locked_tuner['roku_ip'], channel_data)
+    TUNE_EXECUTOR.submit(execute_tuning_in_background, locked_tuner['roku_ip'], channel_data)
     if channel_data.get('keep_alive_enabled') and channel_data.get('keep_alive_key'):
         interval = channel_data.get('keep_alive_interval', 225)
-        stop_event = threading.Event()
-        thread = threading.Thread(target=keep_alive_sender, args=(locked_tuner['roku_ip'], channel_data['keep_alive_key'], interval, stop_event))
-        thread.daemon = True
-        thread.start()
-        KEEP_ALIVE_TASKS[locked_tuner['roku_ip']] = (thread, stop_event)
+        cancelled = KEEP_ALIVE_SCHEDULER.schedule(locked_tuner['roku_ip'], channel_data['keep_alive_key'], interval)
+        with KEEP_ALIVE_LOCK:
+            previous = KEEP_ALIVE_TASKS.get(locked_tuner['roku_ip'])
+            KEEP_ALIVE_TASKS[locked_tuner['roku_ip']] = cancelled
+        if previous: previous.set() # Don't leave a keep-alive from an earlier stream running
     tuner_mode = locked_tuner.get('encoding_mode', ENCODING_MODE)
     blank_duration = 0 if is_preview else channel_data.get('blank_duration', 0)
     generator = stream_generator(locked_tuner['encoder_url'], locked_tuner['roku_ip'], tuner_mode, blank_duration)
-    return Response(stream_with_context(generator), mimetype='video/mpeg')
+    return Response(generator, mimetype='video/mpeg', headers=LIVE_STREAM_HEADERS, direct_passthrough=True)
 
 @app.route('/stream/ondemand_stream')
 def stream_ondemand():
@@ -291,74 +516,92 @@ def stream_ondemand():
     if not tuner_ip:
         return "Tuner IP is required.", 400
 
-    with SESSION_LOCK:
-        session = PREVIEW_SESSIONS.get(tuner_ip)
-        if not session or not session['committed']:
-            return "No pre-tuned stream is ready for this tuner.", 404
-        tuner = session['tuner']
+    session = PREVIEW_SESSIONS.get(tuner_ip)
+    if not session or not session['committed']:
+        return "No pre-tuned stream is ready for this tuner.", 404
+    tuner = session['tuner']
 
-    logging.info(f"Channels DVR connected to committed stream from tuner {tuner['name']}")
+    logging.info("Channels DVR connected to committed stream from tuner %s", tuner['name'])
     time.sleep(2) # Give a moment for connection
 
     tuner_mode = tuner.get('encoding_mode', ENCODING_MODE)
     generator = stream_generator(tuner['encoder_url'], tuner['roku_ip'], tuner_mode)
-    return Response(stream_with_context(generator), mimetype='video/mpeg')
-
-def generate_m3u_from_channels(channel_list, playlist_filter=None):
-    m3u_content = [f"#EXTM3U x-tvh-max-streams={len(TUNERS)}"]
+    return Response(generator, mimetype='video/mpeg', headers=LIVE_STREAM_HEADERS, direct_passthrough=True)
+
+# --- M3U Tag Mapping ---
+# Maps each EXTINF attribute to the channel config key it is read from. This
+# covers all custom EPG fields and also works for Gracenote channels to allow
+# overrides. 'group-title' is last so it follows the guide fields in the output.
+M3U_TAGS = tuple((f' {tag}="'.encode(), key) for tag, key in (
+    ("tvg-name", "name"),
+    ("channel-number", "channel-number"),
+    ("tvg-logo", "tvg-logo"),
+    ("tvc-guide-stationid", "tvc_guide_stationid"),
+    ("tvc-guide-art", "tvc-guide-art"),
+    ("tvc-guide-title", "tvc-guide-title"),
+    ("tvc-guide-description", "tvc-guide-description"),
+    ("tvc-guide-tags", "tvc-guide-tags"),
+    ("tvc-guide-genres", "tvc-guide-genres"),
+    ("tvc-guide-categories", "tvc-guide-categories"),
+    ("tvc-guide-placeholders", "tvc-guide-placeholders"),
+    ("tvc-stream-vcodec", "tvc-stream-vcodec"),
+    ("tvc-stream-acodec", "tvc-stream-acodec"),
+    ("group-title", "playlist"),
+))
+
+def generate_m3u_from_channels(channel_list, playlist_filter=None, host=None):
+    buf = bytearray(f"#EXTM3U x-tvh-max-streams={len(TUNERS)}".encode())
     filtered_list = channel_list
     if playlist_filter:
         filtered_list = [ch for ch in channel_list if ch.get('playlist') == playlist_filter]
-        logging.info(f"Filtering M3U for playlist='{playlist_filter}'. Found {len(filtered_list)} matching channels.")
+        logging.info("Filtering M3U for playlist='%s'. Found %s matching channels.", playlist_filter, len(filtered_list))
+    stream_prefix = b'http://' + (host or request.host.encode()) + b'/stream/'
     for channel in filtered_list:
-        stream_url = f"http://{request.host}/stream/{channel['id']}"
-        extinf_line = f'#EXTINF:-1 channel-id="{channel["id"]}"'
-        
-        # --- START OF FIX ---
-        # Expanded the tags dictionary to include all possible custom EPG fields.
-        # This now also works for Gracenote channels to allow overrides.
-        tags = {
-            "tvg-name": "name",
-            "channel-number": "channel-number",
-            "tvg-logo": "tvg-logo",
-            "tvc-guide-stationid": "tvc_guide_stationid",
-            "tvc-guide-art": "tvc-guide-art",
-            "tvc-guide-title": "tvc-guide-title",
-            "tvc-guide-description": "tvc-guide-description",
-            "tvc-guide-tags": "tvc-guide-tags",
-            "tvc-guide-genres": "tvc-guide-genres",
-            "tvc-guide-categories": "tvc-guide-categories",
-            "tvc-guide-placeholders": "tvc-guide-placeholders",
-            "tvc-stream-vcodec": "tvc-stream-vcodec",
-            "tvc-stream-acodec": "tvc-stream-acodec"
-        }
-        # --- END OF FIX ---
-
-        for tag, key in tags.items():
-            if key in channel and channel[key]:
-                # For tags that can be comma-separated lists, ensure they are formatted correctly.
-                if isinstance(channel[key], list):
-                    extinf_line += f' {tag}="{",".join(map(str, channel[key]))}"'
-                else:
-                    extinf_line += f' {tag}="{channel[key]}"'
-
-        if 'playlist' in channel and channel['playlist']:
-            extinf_line += f' group-title="{channel["playlist"]}"'
-            
-        extinf_line += f',{channel["name"]}'
-        m3u_content.extend([extinf_line, stream_url])
-        
-    return Response("\n".join(m3u_content), mimetype='audio/x-mpegurl')
+        channel_id = str(channel['id']).encode()
+        buf += b'\n#EXTINF:-1 channel-id="'
+        buf += channel_id
+        buf += b'"'
+        for tag_prefix, key in M3U_TAGS:
+            value = channel.get(key)
+            if not value:
+                continue
+            # For tags that can be comma-separated lists, ensure they are formatted correctly.
+            if type(value) is list:
+                value = ",".join(map(str, value))
+            buf += tag_prefix
+            buf += str(value).encode()
+            buf += b'"'
+        buf += b','
+        buf += str(channel['name']).encode()
+        buf += b'\n'
+        buf += stream_prefix
+        buf += channel_id
+
+    return bytes(buf)
+
+def cached_m3u_response(list_name, channel_list, playlist_filter):
+    playlist_filter = playlist_filter or None
+    cache_key = (list_name, playlist_filter)
+    cached = M3U_CACHE.get(cache_key)
+    if cached is None:
+        template = generate_m3u_from_channels(channel_list, playlist_filter, M3U_HOST_PLACEHOLDER)
+        cached = (hashlib.md5(template).digest(), template.split(M3U_HOST_PLACEHOLDER))
+        if playlist_filter is None or any(ch.get('playlist') == playlist_filter for ch in channel_list):
+            M3U_CACHE[cache_key] = cached
+    host = request.host.encode()
+    response = Response(host.join(cached[1]), mimetype='audio/x-mpegurl')
+    response.set_etag(hashlib.md5(cached[0] + host).hexdigest())
+    return response.make_conditional(request) # 304 when If-None-Match matches
 
 @app.route('/channels.m3u')
 def generate_gracenote_m3u():
     playlist_filter = request.args.get('playlist')
-    return generate_m3u_from_channels(CHANNELS, playlist_filter)
+    return cached_m3u_response('gracenote', CHANNELS, playlist_filter)
 
 @app.route('/epg_channels.m3u')
 def generate_epg_m3u():
     playlist_filter = request.args.get('playlist')
-    return generate_m3u_from_channels(EPG_CHANNELS, playlist_filter)
+    return cached_m3u_response('epg', EPG_CHANNELS, playlist_filter)
 
 @app.route('/ondemand.m3u')
 def generate_ondemand_m3u():
@@ -423,6 +666,7 @@ def status_page():
 # --- UPDATED API ENDPOINT ---
 @app.route('/api/config', methods=['GET', 'POST'])
 def api_config():
+    global CONFIG_BODY_CACHE
     if request.method == 'POST':
         try:
             new_config = request.get_json()
@@ -446,20 +690,25 @@ def api_config():
                 "ondemand_apps": new_config.get("ondemand_apps", []),
                 "ondemand_settings": new_config.get("ondemand_settings", {})
             }
-            with open(CONFIG_FILE_PATH, 'w') as f: json.dump(validated_config, f, indent=2)
-            load_config()
-            os.kill(os.getppid(), signal.SIGHUP)
-            return jsonify({"message": "Configuration saved. Server is reloading."}), 200
+            with open(CONFIG_FILE_PATH, 'wb') as f: f.write(orjson.dumps(validated_config, option=orjson.OPT_INDENT_2))
+            load_config() # Applied in place; active streams keep running
+            return jsonify({"message": "Configuration saved."}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 500
     else: # GET
         try:
-            with open(CONFIG_FILE_PATH, 'r') as f: config_data = json.load(f)
-            config_data['ondemand_apps'] = config_data.get('ondemand_apps', [])
-            config_data['ondemand_settings'] = config_data.get('ondemand_settings', {})
-            return jsonify(config_data)
+            st = os.stat(CONFIG_FILE_PATH)
+            file_key = (st.st_mtime_ns, st.st_size)
+            cached_key, body = CONFIG_BODY_CACHE
+            if cached_key != file_key:
+                with open(CONFIG_FILE_PATH, 'rb') as f: config_data = orjson.loads(f.read())
+                config_data['ondemand_apps'] = config_data.get('ondemand_apps', [])
+                config_data['ondemand_settings'] = config_data.get('ondemand_settings', {})
+                body = orjson.dumps(config_data)
+                CONFIG_BODY_CACHE = (file_key, body)
+            return Response(body, mimetype='application/json')
         except FileNotFoundError:
-            return jsonify({"tuners": [], "channels": [], "epg_channels": [], "ondemand_apps": [], "ondemand_settings": {}})
+            return ojsonify({"tuners": [], "channels": [], "epg_channels": [], "ondemand_apps": [], "ondemand_settings": {}})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -471,10 +720,9 @@ def upload_config():
     if file.filename == '' or not file.filename.endswith('.json'): return "Invalid file", 400
     try:
         filename = secure_filename(file.filename)
-        file.save(CONFIG_FILE_PATH)
-        load_config()
-        os.kill(os.getppid(), signal.SIGHUP)
-        return "Configuration updated successfully. Server is reloading...", 200
+        file.save(CONFIG_FILE_PATH, buffer_size=UPLOAD_BUFFER_SIZE)
+        load_config() # Applied in place; active streams keep running
+        return "Configuration updated successfully.", 200
     except Exception as e:
         return f"Error processing config file: {e}", 400
 
@@ -490,33 +738,35 @@ def upload_plugin():
         save_path = os.path.join(plugins_dir, filename)
         if not os.path.normpath(save_path).startswith(os.path.abspath(plugins_dir)):
             return "Invalid filename", 400
-        file.save(save_path)
-        logging.info(f"New plugin uploaded: {filename}")
-        os.kill(os.getppid(), signal.SIGHUP)
+        file.save(save_path, buffer_size=UPLOAD_BUFFER_SIZE)
+        logging.info("New plugin uploaded: %s", filename)
+        request_server_reload()
         return "Plugin uploaded successfully. Server is reloading...", 200
     except Exception as e:
-        logging.error(f"Error saving plugin: {e}")
+        logging.error("Error saving plugin: %s", e)
         return f"Error saving plugin file: {e}", 500
 
 # --- NEW Pre-Tune API ---
 @app.route('/api/preview/stop', methods=['POST'])
 def api_preview_stop():
-    with TUNER_LOCK:
-        for tuner in TUNERS:
-            with SESSION_LOCK:
-                is_in_preview_session = tuner['roku_ip'] in PREVIEW_SESSIONS
-            if tuner['in_use'] and not is_in_preview_session:
-                release_tuner(tuner['roku_ip'])
-                return jsonify({"status": "success", "message": f"Released tuner {tuner.get('name')}"})
+    for tuner in TUNERS:
+        if tuner['in_use'].is_set() and tuner['roku_ip'] not in PREVIEW_SESSIONS:
+            release_tuner(tuner['roku_ip'])
+            return jsonify({"status": "success", "message": f"Released tuner {tuner.get('name')}"})
     return jsonify({"status": "error", "message": "No active preview stream tuner found to release."})
 
 @app.route('/api/pretune/status')
 def api_pretune_status():
-    with SESSION_LOCK:
-        active_ips = set(PREVIEW_SESSIONS.keys())
+    global PRETUNE_STATUS_SNAPSHOT
+    built_at, body = PRETUNE_STATUS_SNAPSHOT
+    now = time.monotonic()
+    if now - built_at < PRETUNE_STATUS_TTL:
+        return Response(body, mimetype='application/json')
+
+    active_ips = set(PREVIEW_SESSIONS)
     status = []
     for tuner in TUNERS:
-        tuner_status = "in-use" if tuner['in_use'] else "available"
+        tuner_status = "in-use" if tuner['in_use'].is_set() else "available"
         if tuner['roku_ip'] in active_ips:
             tuner_status = "pre-tuning"
         status.append({
@@ -524,7 +774,9 @@ def api_pretune_status():
             "roku_ip": tuner['roku_ip'],
             "status": tuner_status
         })
-    return jsonify(status)
+    body = orjson.dumps(status)
+    PRETUNE_STATUS_SNAPSHOT = (now, body)
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/pretune/start', methods=['POST'])
 def api_pretune_start():
@@ -552,104 +804,143 @@ def api_pretune_commit():
 @app.route('/api/pretune/stream')
 def api_pretune_stream():
     tuner_ip = request.args.get('tuner_ip')
-    with SESSION_LOCK:
-        if tuner_ip not in PREVIEW_SESSIONS:
-            return "No active preview session for this tuner.", 404
-        tuner = PREVIEW_SESSIONS[tuner_ip]['tuner']
-        encoder_url = tuner['encoder_url']
+    session = PREVIEW_SESSIONS.get(tuner_ip)
+    if not session:
+        return "No active preview session for this tuner.", 404
+    encoder_url = session['tuner']['encoder_url']
     try:
-        req = requests.get(encoder_url, stream=True, timeout=10)
-        return Response(stream_with_context(req.iter_content(chunk_size=8192)), content_type=req.headers['content-type'])
+        upstream = STREAM_CLIENT.send(STREAM_CLIENT.build_request("GET", encoder_url, timeout=10), stream=True)
     except Exception as e:
-        logging.error(f"Error proxying pretune stream from {encoder_url}: {e}")
+        logging.error("Error proxying pretune stream from %s: %s", encoder_url, e)
         return "Failed to connect to encoder.", 500
 
+    # The server closes the body iterable even if it was never iterated, so the pooled
+    # connection comes back when the client leaves before the first chunk. With
+    # direct_passthrough, Response.call_on_close hooks never run, hence ClosingIterator.
+    body = ClosingIterator(upstream.iter_raw(65536), upstream.close)
+    return Response(body, content_type=upstream.headers.get('content-type', 'video/mpeg'), headers=LIVE_STREAM_HEADERS, direct_passthrough=True)
+
 @app.route('/remote/launch/<device_ip>/<app_id>', methods=['POST'])
 def remote_launch(device_ip, app_id):
     try:
-        roku_session.post(f"http://{device_ip}:8060/launch/{app_id}")
+        roku_post(f"http://{device_ip}:8060/launch/{app_id}")
         return jsonify({"status": "success"})
     except requests.exceptions.RequestException as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/remote/keypress/<device_ip>/<key>', methods=['POST'])
 def remote_keypress(device_ip, key):
-    with SESSION_LOCK:
-        is_in_preview = device_ip in PREVIEW_SESSIONS
-    if not any(t['roku_ip'] == device_ip for t in TUNERS) and not is_in_preview:
+    if device_ip not in TUNERS_BY_IP and device_ip not in PREVIEW_SESSIONS:
         return jsonify({"status": "error", "message": "Device not found or not in a session."}), 404
     try:
-        roku_session.post(f"http://{device_ip}:8060/keypress/{urllib.parse.quote(key)}")
+        roku_post(f"http://{device_ip}:8060/keypress/{urllib.parse.quote(key)}")
         return jsonify({"status": "success"})
     except requests.exceptions.RequestException as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/remote/reboot/<device_ip>', methods=['POST'])
 def remote_reboot(device_ip):
-    if not any(t['roku_ip'] == device_ip for t in TUNERS): return jsonify({"status": "error", "message": "Device not found."}), 404
+    if device_ip not in TUNERS_BY_IP: return jsonify({"status": "error", "message": "Device not found."}), 404
     reboot_sequence = ['Home', 'Home', 'Home', 'Up', 'Right', 'Up', 'Right', 'Up', 'Up', 'Right', 'Select']
-    executor.submit(send_key_sequence, device_ip, reboot_sequence)
+    if not submit_key_sequence(device_ip, reboot_sequence, default_delay=0.3):
+        return jsonify({"status": "error", "message": "Too many remote sequences in progress. Try again shortly."}), 503
     return jsonify({"status": "success", "message": "Reboot sequence initiated."})
 
 @app.route('/remote/devices')
 def get_remote_devices():
-    return jsonify([{"name": t.get("name", t["roku_ip"]), "roku_ip": t["roku_ip"]} for t in TUNERS])
-
-@app.route('/api/status')
-def api_status():
-    def check_tuner_status(tuner):
-        roku_ip = tuner['roku_ip']
-        encoder_url = tuner['encoder_url']
-        roku_status, roku_error = 'offline', 'Unknown Error'
-        encoder_status, encoder_error = 'offline', 'Unknown Error'
-
-        try:
-            # Increased timeout and added specific error handling for Roku
-            roku_session.get(f"http://{roku_ip}:8060", timeout=8)
-            roku_status = 'online'
-            roku_error = ''
-        except requests.exceptions.Timeout:
-            roku_error = 'Timeout'
-        except requests.exceptions.ConnectionError:
-            roku_error = 'Connection Refused'
-        except requests.exceptions.RequestException as e:
-            roku_error = str(e)
+    return ojsonify([{"name": t.get("name", t["roku_ip"]), "roku_ip": t["roku_ip"]} for t in TUNERS])
 
+def probe_roku(roku_ip):
+    try:
+        PROBE_CLIENT.get(f"http://{roku_ip}:8060")
+        return 'online', ''
+    except httpx.TimeoutException:
+        return 'offline', 'Timeout'
+    except httpx.TransportError:
+        return 'offline', 'Connection Refused'
+    except httpx.HTTPError as e:
+        return 'offline', str(e)
+
+def probe_encoder(encoder_url):
+    try:
+        # A HEAD request doesn't make the encoder start a stream. Encoders that refuse
+        # HEAD (any non-2xx answer, or a dropped connection) are checked by reading one
+        # byte of the stream instead, and are offline only if that fails too.
         try:
-            # Increased timeout and added specific error handling for Encoder
-            with requests.get(encoder_url, timeout=10, stream=True, allow_redirects=True) as response:
-                response.raise_for_status()
-                if next(response.iter_content(1), None):
-                    encoder_status = 'online'
-                    encoder_error = ''
-        except requests.exceptions.Timeout:
-            encoder_error = 'Timeout'
-        except requests.exceptions.ConnectionError:
-            encoder_error = 'Connection Refused'
-        except requests.exceptions.RequestException as e:
-            encoder_error = f'HTTP {response.status_code}' if 'response' in locals() else str(e)
+            if PROBE_CLIENT.head(encoder_url).is_success:
+                return 'online', ''
+        except httpx.ProtocolError:
+            pass
+        with PROBE_CLIENT.stream("GET", encoder_url) as response:
+            response.raise_for_status()
+            if next(response.iter_raw(1), None):
+                return 'online', ''
+            return 'offline', 'Unknown Error'
+    except httpx.TimeoutException:
+        return 'offline', 'Timeout'
+    except httpx.HTTPStatusError as e:
+        return 'offline', f'HTTP {e.response.status_code}'
+    except httpx.TransportError:
+        return 'offline', 'Connection Refused'
+    except httpx.HTTPError as e:
+        return 'offline', str(e)
+
+def run_status_probe(cache_key, probe, target):
+    try:
+        result = probe(target)
+    except Exception as e:
+        result = ('offline', str(e))
+    with STATUS_CACHE_LOCK:
+        STATUS_CACHE[cache_key] = (time.monotonic() + STATUS_CACHE_TTL, result)
+    return result
+
+def submit_status_probe(cache_key, probe, target):
+    # Returns the last completed result (None before the first one) and the running
+    # probe's future, or None when that result is still fresh.
+    with STATUS_CACHE_LOCK:
+        cached = STATUS_CACHE.get(cache_key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1], None
+        future = STATUS_IN_FLIGHT.get(cache_key)
+        if future is None:
+            future = STATUS_IN_FLIGHT[cache_key] = STATUS_EXECUTOR.submit(run_status_probe, cache_key, probe, target)
+            future.add_done_callback(lambda _: STATUS_IN_FLIGHT.pop(cache_key, None))
+    return (cached[1] if cached else None), future
 
-        return {
-            "name": tuner.get("name", roku_ip),
-            "roku_ip": roku_ip,
-            "encoder_url": encoder_url,
+@app.route('/api/status')
+def api_status():
+    tuners = TUNERS
+    probes = [(submit_status_probe(('roku', t['roku_ip']), probe_roku, t['roku_ip']),
+               submit_status_probe(('encoder', t['encoder_url']), probe_encoder, t['encoder_url'])) for t in tuners]
+    wait([future for pair in probes for _, future in pair if future], timeout=STATUS_TIMEOUT)
+
+    def probe_result(last_result, future):
+        if future and future.done():
+            return future.result()
+        return last_result or ('offline', 'Timeout')
+
+    statuses = []
+    for tuner, (roku_probe, encoder_probe) in zip(tuners, probes):
+        roku_status, roku_error = probe_result(*roku_probe)
+        encoder_status, encoder_error = probe_result(*encoder_probe)
+        statuses.append({
+            "name": tuner.get("name", tuner['roku_ip']),
+            "roku_ip": tuner['roku_ip'],
+            "encoder_url": tuner['encoder_url'],
             "roku_status": roku_status,
             "roku_error": roku_error,
             "encoder_status": encoder_status,
             "encoder_error": encoder_error
-        }
-
-    with ThreadPoolExecutor(max_workers=len(TUNERS) or 1) as status_executor:
-        statuses = list(status_executor.map(check_tuner_status, TUNERS))
+        })
 
-    tuner_configs = [{"name": t.get("name", t["roku_ip"]), "roku_ip": t["roku_ip"], "encoder_url": t["encoder_url"]} for t in TUNERS]
-    return jsonify({"tuners": tuner_configs, "statuses": statuses})
+    tuner_configs = [{"name": t.get("name", t["roku_ip"]), "roku_ip": t["roku_ip"], "encoder_url": t["encoder_url"]} for t in tuners]
+    return ojsonify({"tuners": tuner_configs, "statuses": statuses})
 
 
 @app.route('/api/plugins')
 def api_plugins():
     plugin_list = [{"id": script_name, "name": plugin.app_name} for script_name, plugin in discovered_plugins.items()]
-    return jsonify(plugin_list)
+    return ojsonify(plugin_list)
 
 if __name__ != '__main__':
 
@@ -1,27 +1,31 @@
-import os
 import importlib
-import inspect
+import importlib.resources
+import types
 from .base_plugin import BaseAppPlugin
 
 # --- Plugin Discovery ---
 discovered_plugins = {}
+# Read-only view of the same plugins keyed by Roku app ID, built once discovery has run.
+plugins_by_app_id = types.MappingProxyType({})
 
 def discover_plugins():
     """
     Dynamically discovers and loads plugins from the 'plugins' directory.
     """
-    global discovered_plugins
+    global discovered_plugins, plugins_by_app_id
     if discovered_plugins:
         return
 
-    plugins_dir = os.path.dirname(__file__)
-    for filename in os.listdir(plugins_dir):
+    for entry in importlib.resources.files(__name__).iterdir():
+        filename = entry.name
         if filename.endswith('_plugin.py'):
-            module_name = f"plugins.{filename[:-3]}"
+            module_name = f"{__name__}.{filename[:-3]}"
             try:
                 module = importlib.import_module(module_name)
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    if issubclass(obj, BaseAppPlugin) and obj is not BaseAppPlugin:
+                # Only classes defined in the plugin module itself, so classes it
+                # imports are never instantiated a second time.
+                for obj in vars(module).values():
+                    if isinstance(obj, type) and obj.__module__ == module_name and issubclass(obj, BaseAppPlugin) and obj is not BaseAppPlugin:
                         instance = obj()
                         # Use the python script filename as the key
                         script_name = filename
@@ -29,5 +33,12 @@ def discover_plugins():
                         print(f"Successfully loaded plugin: {instance.app_name} from {script_name}")
             except Exception as e:
                 print(f"Error loading plugin from {filename}: {e}")
+    plugins_by_app_id = types.MappingProxyType({p.app_id: p for p in discovered_plugins.values()})
+
+def get_plugin(key):
+    """
+    Returns the plugin registered under a script filename or a Roku app ID, or None.
+    """
+    return discovered_plugins.get(key) or plugins_by_app_id.get(key)
 
 discover_plugins()
\ No newline at end of file
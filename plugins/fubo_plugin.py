@@ -3,8 +3,44 @@ A specific plugin implementation for the Fubo app (Roku App ID: 43465).
 This app often requires navigating to a specific live event from a list.
 """
 from .base_plugin import BaseAppPlugin
+import functools
 import logging
 
+@functools.lru_cache(maxsize=512)
+def _build_sequence(list_position):
+    """
+    Builds the Fubo key sequence for a guide position. The result is cached and
+    returned as a tuple; its {"wait": ...} steps are shared by every cached
+    sequence, so they must not be mutated.
+    """
+    # --- START OF CUSTOMIZABLE NAVIGATION ---
+    # This sequence assumes the app opens and you need to navigate to the live guide.
+    # You must watch your TV and adjust this to match the app's behavior.
+    sequence = [
+        # The app is launched by the main script, so we just wait
+        {"wait": 4}, # Wait for the app to load
+
+        "Left",      # Navigate to the left-side menu
+        {"wait": 0.5},
+        "Down",      # Navigate down to the "Live" or "Guide" section
+        {"wait": 0.5},
+        "Select",    # Select it to open the guide
+        {"wait": 1.7}  # Wait for the guide to load
+    ]
+
+    # One "Down" per item above the target, each followed by a small delay.
+    # (Nothing is added for the first item.)
+    sequence.extend(["Down", {"wait": 0.1}] * (list_position - 1))
+
+    # Finally, select the channel to play.
+    sequence.append("Select")
+    sequence.append({"wait": 1})
+    sequence.append("Select")
+    # --- END OF CUSTOMIZABLE NAVIGATION ---
+
+
+    return tuple(sequence)
+
 class FuboPlugin(BaseAppPlugin):
     """
     App-specific plugin for the Fubo app.
@@ -35,34 +71,5 @@ class FuboPlugin(BaseAppPlugin):
             logging.error(f"[{self.app_name} Plugin] Invalid 'list_position' ({list_position}). Must be 1 or greater.")
             return None
 
-        # --- START OF CUSTOMIZABLE NAVIGATION ---
-        # This sequence assumes the app opens and you need to navigate to the live guide.
-        # You must watch your TV and adjust this to match the app's behavior.
-        sequence = [
-            # The app is launched by the main script, so we just wait
-            {"wait": 4}, # Wait for the app to load
-
-            "Left",      # Navigate to the left-side menu
-            {"wait": 0.5},
-            "Down",      # Navigate down to the "Live" or "Guide" section
-            {"wait": 0.5},
-            "Select",    # Select it to open the guide
-            {"wait": 1.7}  # Wait for the guide to load
-        ]
-
-        # Only add navigation steps if we are NOT on the first item.
-        if list_position > 1:
-            # Here, we create a loop of "Down" keypresses.
-            for _ in range(list_position - 1):
-                sequence.append("Down")
-                sequence.append({"wait": 0.1}) # Small delay between presses
-
-        # Finally, select the channel to play.
-        sequence.append("Select")
-        sequence.append({"wait": 1})
-        sequence.append("Select")
-        # --- END OF CUSTOMIZABLE NAVIGATION ---
-
-
-        return sequence
-
+        # The sequence only depends on list_position, so it is built once per position.
+        return list(_build_sequence(list_position))